@@ -6,13 +6,31 @@ and automatically generates trilingual subtitles (Chinese, Pinyin, English)
 """
 
 import os
+import sys
 import time
 import argparse
+import bisect
+import hashlib
 import logging
+import multiprocessing
+import pickle
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import List, Dict, Tuple
-from pypinyin import pinyin, Style
-import re
+from typing import Iterator, List, Dict, Optional, Tuple
+from pypinyin import pinyin, Style, __version__ as pypinyin_version
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    # watchdog is optional; without it watch mode polls the directory
+    FileSystemEventHandler = object
+    Observer = None
 
 # Configure logging
 logging.basicConfig(
@@ -21,12 +39,166 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Subtitle filename suffixes (before .srt) for each language
+CHINESE_SUFFIXES = ('.chs', '.chi', '.zh', '.zho')
+ENGLISH_SUFFIXES = ('.eng', '.en')
+
+# Joins subtitle texts for batch pinyin conversion (Unicode "symbol for unit
+# separator", which is not a Chinese character)
+PINYIN_SEPARATOR = '\u241F'
+
+# Read buffer size used when loading SRT files
+READ_BUFFER_SIZE = 16 * 1024 * 1024
+
+# Bytes of encoded subtitle blocks collected into a single write call
+WRITE_BUFFER_SIZE = 16 * 1024 * 1024
+
+# Parsed subtitles and pinyin are cached here between runs. Bump
+# CACHE_VERSION whenever the cached data or how it is produced changes.
+CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'trilingual_srt'
+CACHE_VERSION = 2
+
+# Cache entries not used for this many seconds are removed by prune_cache
+CACHE_MAX_AGE = 30 * 24 * 60 * 60
+
+# How often a long-running watcher prunes the cache, in seconds
+CACHE_PRUNE_INTERVAL = 24 * 60 * 60
+
+# A directory mtime this many seconds old or newer may not yet reflect every
+# file in it (FAT/exFAT store times with 2 second resolution)
+RACY_MTIME_WINDOW = 3
+
+
+@dataclass
+class SrtTrack:
+    """
+    Subtitle entries of one SRT file, stored as parallel columns.
+    Times in seconds are kept in float arrays for the matching loop.
+    """
+    index: List[str] = field(default_factory=list)
+    start_time: List[str] = field(default_factory=list)
+    end_time: List[str] = field(default_factory=list)
+    start_sec: array = field(default_factory=lambda: array('d'))
+    end_sec: array = field(default_factory=lambda: array('d'))
+    text: List[str] = field(default_factory=list)
+    
+    def __len__(self) -> int:
+        return len(self.text)
+    
+    def append(self, index: str, start_time: str, end_time: str, text: str):
+        self.index.append(index)
+        self.start_time.append(start_time)
+        self.end_time.append(end_time)
+        self.start_sec.append(parse_time(start_time))
+        self.end_sec.append(parse_time(end_time))
+        self.text.append(text)
+    
+    def sorted_by_start(self) -> 'SrtTrack':
+        """
+        Return the entries ordered by start time (self if already sorted).
+        """
+        start_sec = self.start_sec
+        if all(start_sec[i] <= start_sec[i + 1] for i in range(len(start_sec) - 1)):
+            return self
+        
+        order = sorted(range(len(self)), key=start_sec.__getitem__)
+        return SrtTrack(
+            index=[self.index[i] for i in order],
+            start_time=[self.start_time[i] for i in order],
+            end_time=[self.end_time[i] for i in order],
+            start_sec=array('d', (start_sec[i] for i in order)),
+            end_sec=array('d', (self.end_sec[i] for i in order)),
+            text=[self.text[i] for i in order],
+        )
+
+
+def cache_path(key: str) -> Path:
+    """
+    Return the cache file used for a cache key.
+    """
+    digest = hashlib.blake2b(f"{CACHE_VERSION}:{key}".encode('utf-8'), digest_size=16).hexdigest()
+    return CACHE_DIR / f"{digest}.pickle"
+
+
+def cache_load(key: str):
+    """
+    Return the cached value for a key, or None if it is not cached.
+    """
+    path = cache_path(key)
+    try:
+        with open(path, 'rb') as f:
+            value = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.debug(f"Ignoring unreadable cache entry: {e}")
+        return None
+    
+    # Mark the entry as recently used so prune_cache keeps it
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    
+    return value
+
+
+def cache_store(key: str, value):
+    """
+    Cache a value for a key. Failing to write the cache is not an error.
+    """
+    path = cache_path(key)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        
+        # Write to a temporary file first so that worker processes never
+        # read a partly written entry
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(temp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+    except OSError as e:
+        logger.debug(f"Could not write cache entry: {e}")
+
+
+def prune_cache():
+    """
+    Remove cache entries that have not been used for CACHE_MAX_AGE seconds,
+    such as those left behind by replaced subtitle files.
+    """
+    cutoff = time.time() - CACHE_MAX_AGE
+    try:
+        with os.scandir(CACHE_DIR) as entries:
+            for entry in entries:
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                except OSError:
+                    pass
+    except OSError as e:
+        logger.debug(f"Could not prune cache: {e}")
+
 
 def parse_time(time_str: str) -> float:
     """
     Convert SRT timestamp to seconds for comparison.
     Format: 00:01:23,456 -> seconds as float
     """
+    # Fast path for the standard fixed-width HH:MM:SS,mmm layout: work on the
+    # ASCII byte values directly instead of splitting and calling int().
+    # This also beats int() on the fixed-offset slices (four int() calls and
+    # four substrings per timestamp), so keep it as the first choice.
+    b = time_str.encode('ascii', 'replace')
+    if len(b) == 12 and b[2] == 58 and b[5] == 58 and b[8] == 44:
+        digits = b.translate(None, b':,')
+        if len(digits) == 9 and digits.isdigit():
+            return (
+                (b[0] - 48) * 36000 + (b[1] - 48) * 3600 +
+                (b[3] - 48) * 600 + (b[4] - 48) * 60 +
+                (b[6] - 48) * 10 + (b[7] - 48) +
+                ((b[9] - 48) * 100 + (b[10] - 48) * 10 + (b[11] - 48)) / 1000.0
+            )
+    
     time_str = time_str.strip()
     hours, minutes, rest = time_str.split(':')
     seconds, milliseconds = rest.split(',')
@@ -40,42 +212,75 @@ def parse_time(time_str: str) -> float:
     return total_seconds
 
 
-def parse_srt(filename: str) -> List[Dict]:
+def iter_srt_blocks(content: str) -> Iterator[str]:
     """
-    Parse an SRT file and return a list of subtitle entries.
-    Each entry is a dict with: index, start_time, end_time, start_sec, end_sec, text
+    Yield the subtitle blocks of SRT content one at a time.
+    Blocks are separated by blank lines and are returned stripped.
     """
-    with open(filename, 'r', encoding='utf-8') as f:
-        content = f.read()
+    pos = 0
+    length = len(content)
+    while pos < length:
+        # Skip the blank lines between subtitle blocks
+        while pos < length and content[pos] == '\n':
+            pos += 1
+        
+        # A block runs until the next blank line
+        end = content.find('\n\n', pos)
+        if end < 0:
+            end = length
+        
+        block = content[pos:end].strip()
+        if block:
+            yield block
+        pos = end
+
+
+def parse_srt(filename: str) -> SrtTrack:
+    """
+    Parse an SRT file and return its subtitle entries as an SrtTrack.
+    Results are cached on disk until the file's mtime or size changes.
+    """
+    stat = os.stat(filename)
+    cache_key = f"srt:{os.path.abspath(filename)}:{stat.st_mtime_ns}:{stat.st_size}"
+    cached = cache_load(cache_key)
+    if cached is not None:
+        return SrtTrack(**cached)
+    
+    with open(filename, 'rb', buffering=READ_BUFFER_SIZE) as f:
+        content = f.read().decode('utf-8')
     
-    # Split by double newlines to get individual subtitle blocks
-    blocks = re.split(r'\n\n+', content.strip())
+    # Normalize Windows and old Mac line endings
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
     
-    subtitles = []
-    for block in blocks:
-        lines = block.strip().split('\n')
+    subtitles = SrtTrack()
+    for block in iter_srt_blocks(content):
+        # Split off the index and timestamp lines, keeping the text intact
+        lines = block.split('\n', 2)
         if len(lines) < 3:
             continue
         
         # Parse the subtitle block
         index = lines[0].strip()
         timestamp = lines[1].strip()
-        text = '\n'.join(lines[2:])
+        text = lines[2]
         
-        # Extract start and end times
-        times = timestamp.split(' --> ')
-        if len(times) == 2:
+        # Extract start and end times, slicing the standard fixed-width
+        # layout directly and falling back to splitting on the arrow
+        if len(timestamp) >= 29 and timestamp[12:17] == ' --> ':
+            start_time = timestamp[:12]
+            end_time = timestamp[17:29]
+        else:
+            times = timestamp.split(' --> ')
+            if len(times) != 2:
+                continue
             start_time = times[0].strip()
             end_time = times[1].strip()
-            
-            subtitles.append({
-                'index': index,
-                'start_time': start_time,
-                'end_time': end_time,
-                'start_sec': parse_time(start_time),
-                'end_sec': parse_time(end_time),
-                'text': text
-            })
+        
+        subtitles.append(index, start_time, end_time, text)
+    
+    # Cache the plain field values rather than the SrtTrack itself
+    cache_store(cache_key, vars(subtitles))
     
     return subtitles
 
@@ -83,108 +288,256 @@ def parse_srt(filename: str) -> List[Dict]:
 def chinese_to_pinyin(text: str) -> str:
     """
     Convert Chinese text to pinyin with tone marks.
+    Whitespace around syllables and non-Chinese runs is stripped, so
+    'OK 好 的' becomes 'OK hǎo de' rather than 'OK  hǎo   de'.
     """
     # Generate pinyin with tone marks
     pinyin_list = pinyin(text, style=Style.TONE)
     
     # Join the pinyin syllables with spaces
-    result = ' '.join([p[0] for p in pinyin_list])
+    pieces = (p[0].strip() for p in pinyin_list)
+    result = ' '.join([piece for piece in pieces if piece])
     
     return result
 
 
-def find_matching_english(chinese_sub: Dict, english_subs: List[Dict], last_match_index: int = 0) -> Tuple[Dict, int]:
+def chinese_to_pinyin_batch(texts: List[str]) -> List[str]:
+    """
+    Convert a list of Chinese texts to pinyin with tone marks in one call.
+    Line breaks are replaced with spaces so each result stays on one line,
+    and results match chinese_to_pinyin for each text.
+    Results are cached on disk by a hash of the texts.
+    """
+    if not texts:
+        return []
+    
+    # Repeated lines only need converting once
+    unique_texts = list(dict.fromkeys(text.replace('\n', ' ') for text in texts))
+    
+    # Join everything with a separator that has no pinyin, so pypinyin is
+    # called once per file instead of once per subtitle
+    joined = PINYIN_SEPARATOR.join(unique_texts)
+    
+    # Readings depend on pypinyin's dictionaries, so a new version must not
+    # reuse pinyin cached by an older one
+    digest = hashlib.blake2b(joined.encode('utf-8'), digest_size=16).hexdigest()
+    cache_key = f"pinyin:{pypinyin_version}:{digest}"
+    results = cache_load(cache_key)
+    if results is not None and len(results) == len(unique_texts):
+        pinyin_by_text = dict(zip(unique_texts, results))
+        return [pinyin_by_text[text.replace('\n', ' ')] for text in texts]
+    
+    pinyin_list = pinyin(joined, style=Style.TONE, errors='default')
+    
+    # Split the syllables back up per text. Non-Chinese runs come back as a
+    # single entry, so the separator may be embedded in one with other text.
+    results = []
+    current = []
+    for p in pinyin_list:
+        pieces = p[0].split(PINYIN_SEPARATOR)
+        for i, piece in enumerate(pieces):
+            if i > 0:
+                results.append(' '.join(current))
+                current = []
+            piece = piece.strip()
+            if piece:
+                current.append(piece)
+    results.append(' '.join(current))
+    
+    # A separator inside the input text would misalign everything after it
+    if len(results) != len(unique_texts):
+        results = [chinese_to_pinyin(text) for text in unique_texts]
+    
+    cache_store(cache_key, results)
+    
+    pinyin_by_text = dict(zip(unique_texts, results))
+    return [pinyin_by_text[text.replace('\n', ' ')] for text in texts]
+
+
+def find_matching_english(start_sec: float, end_sec: float, english: SrtTrack, lo: int, hi: int) -> Optional[int]:
     """
-    Find the English subtitle that best matches the Chinese subtitle timing.
-    Uses timestamp overlap to match.
+    Find the English subtitle that best matches a Chinese subtitle's timing.
+    Uses timestamp overlap to match, considering only entries lo to hi-1.
+    Returns the position of the best English entry, or None.
     """
     best_match = None
     best_overlap = 0
-    best_index = last_match_index
+    eng_start = english.start_sec
+    eng_end = english.end_sec
     
-    # Start searching from the last matched index to improve performance
-    for i in range(last_match_index, len(english_subs)):
-        eng = english_subs[i]
-        
+    for i in range(lo, hi):
         # Calculate overlap between Chinese and English subtitle times
-        overlap_start = max(chinese_sub['start_sec'], eng['start_sec'])
-        overlap_end = min(chinese_sub['end_sec'], eng['end_sec'])
-        overlap = overlap_end - overlap_start
+        overlap = min(end_sec, eng_end[i]) - max(start_sec, eng_start[i])
         
         if overlap > 0 and overlap > best_overlap:
             best_overlap = overlap
-            best_match = eng
-            best_index = i
-        
-        # If we've passed the Chinese subtitle's end time, stop searching
-        if eng['start_sec'] > chinese_sub['end_sec']:
-            break
+            best_match = i
     
-    return best_match, best_index
+    return best_match
 
 
-def merge_subtitles_by_time(chinese_subs: List[Dict], english_subs: List[Dict]) -> List[Dict]:
+def merge_subtitles_by_time(chinese: SrtTrack, english: SrtTrack) -> List[Dict]:
     """
     Merge Chinese and English subtitles by matching timestamps.
     """
     merged = []
-    last_match_index = 0
     
-    for chinese in chinese_subs:
-        # Find the best matching English subtitle
-        english, last_match_index = find_matching_english(
-            chinese, english_subs, last_match_index
-        )
+    # The matching window below only moves forward, so English subtitles
+    # must be in start order
+    english = english.sorted_by_start()
+    eng_start = english.start_sec
+    eng_end = english.end_sec
+    eng_count = len(english)
+    
+    # Match Chinese subtitles in start order too, keeping a running lower
+    # bound lo past English entries that can no longer overlap
+    ch_start = chinese.start_sec
+    ch_end = chinese.end_sec
+    matches = [None] * len(chinese)
+    lo = 0
+    for i in sorted(range(len(chinese)), key=ch_start.__getitem__):
+        # Drop English subtitles that ended before this one starts
+        while lo < eng_count and eng_end[lo] <= ch_start[i]:
+            lo += 1
         
-        if english:
-            # Generate pinyin from Chinese text
-            pinyin_text = chinese_to_pinyin(chinese['text'])
-            
-            # Create merged entry using Chinese timestamps
-            merged.append({
-                'index': str(len(merged) + 1),
-                'start_time': chinese['start_time'],
-                'end_time': chinese['end_time'],
-                'chinese': chinese['text'],
-                'pinyin': pinyin_text,
-                'english': english['text']
-            })
-        else:
-            # No English match found - Chinese only with pinyin
-            pinyin_text = chinese_to_pinyin(chinese['text'])
-            merged.append({
-                'index': str(len(merged) + 1),
-                'start_time': chinese['start_time'],
-                'end_time': chinese['end_time'],
-                'chinese': chinese['text'],
-                'pinyin': pinyin_text,
-                'english': '[No English subtitle]'
-            })
+        # Binary search for the first English subtitle starting at or after
+        # this one's end, so a long Chinese subtitle does not widen the
+        # window for the ones after it
+        hi = bisect.bisect_left(eng_start, ch_end[i], lo)
+        
+        matches[i] = find_matching_english(ch_start[i], ch_end[i], english, lo, hi)
+    
+    pinyin_texts = chinese_to_pinyin_batch(chinese.text)
+    
+    for i, (pinyin_text, match) in enumerate(zip(pinyin_texts, matches)):
+        # Create merged entry using Chinese timestamps; with no English
+        # match it is Chinese only with pinyin
+        merged.append({
+            'index': str(len(merged) + 1),
+            'start_time': chinese.start_time[i],
+            'end_time': chinese.end_time[i],
+            'chinese': chinese.text[i],
+            'pinyin': pinyin_text,
+            'english': english.text[match] if match is not None else '[No English subtitle]'
+        })
     
     return merged
 
 
+def write_all(fd: int, data: bytes):
+    """
+    Write all of data to a file descriptor, retrying short writes.
+    """
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
 def write_trilingual_srt(subtitles: List[Dict], output_filename: str):
     """
     Write the trilingual subtitles to an SRT file.
     Format: Chinese (single line), Pinyin (single line), English (can be multi-line)
     """
-    with open(output_filename, 'w', encoding='utf-8') as f:
+    # Write pre-encoded UTF-8 straight to the file descriptor, bypassing the
+    # text IO layer. Newlines are always written as \n.
+    fd = os.open(output_filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o666)
+    try:
+        chunks = []
+        chunk_size = 0
         for sub in subtitles:
-            # Write subtitle block
-            f.write(f"{sub['index']}\n")
-            f.write(f"{sub['start_time']} --> {sub['end_time']}\n")
-            
             # Chinese - replace line breaks with spaces to keep on one line
             chinese_single_line = sub['chinese'].replace('\n', ' ')
-            f.write(f"{chinese_single_line}\n")
             
-            # Pinyin - already single line
-            f.write(f"{sub['pinyin']}\n")
+            # Pinyin is already single line, English is kept as-is (may have
+            # multiple lines), and a blank line separates blocks
+            block = (
+                f"{sub['index']}\n"
+                f"{sub['start_time']} --> {sub['end_time']}\n"
+                f"{chinese_single_line}\n"
+                f"{sub['pinyin']}\n"
+                f"{sub['english']}\n"
+                "\n"
+            ).encode('utf-8')
+            chunks.append(block)
+            chunk_size += len(block)
             
-            # English - keep as-is (may have multiple lines)
-            f.write(f"{sub['english']}\n")
-            f.write("\n")  # Blank line between blocks
+            # Flush in large chunks so huge merges don't build one giant buffer
+            if chunk_size >= WRITE_BUFFER_SIZE:
+                write_all(fd, b''.join(chunks))
+                chunks.clear()
+                chunk_size = 0
+        
+        write_all(fd, b''.join(chunks))
+    finally:
+        os.close(fd)
+
+
+def classify_subtitle_name(name: str) -> Optional[Tuple[str, str, int]]:
+    """
+    Classify a subtitle filename by its language suffix.
+    Returns (language, base_name, rank) where language is 'chinese' or
+    'english' and rank is the suffix's position in its suffix list, or None
+    if the file is not a Chinese or English subtitle.
+    """
+    if not name.endswith('.srt') or name.startswith('.'):
+        return None
+    stem = name[:-len('.srt')]
+    
+    for language, suffixes in (('chinese', CHINESE_SUFFIXES), ('english', ENGLISH_SUFFIXES)):
+        for rank, suffix in enumerate(suffixes):
+            if stem.endswith(suffix):
+                return language, stem[:-len(suffix)], rank
+    
+    return None
+
+
+def add_subtitle(subtitles: Dict[str, Dict[str, str]], path: str) -> Optional[Tuple[str, str]]:
+    """
+    Add a subtitle file to a mapping from scan_subtitles. When several
+    suffixes exist for one base name, the earliest suffix in
+    CHINESE_SUFFIXES / ENGLISH_SUFFIXES wins.
+    Returns (language, base_name) if the path was added, otherwise None.
+    """
+    info = classify_subtitle_name(os.path.basename(path))
+    if info is None:
+        return None
+    
+    language, base_name, rank = info
+    existing = subtitles[language].get(base_name)
+    if existing is not None and classify_subtitle_name(os.path.basename(existing))[2] < rank:
+        return None
+    
+    subtitles[language][base_name] = path
+    return language, base_name
+
+
+def scan_subtitles(directory: str) -> Dict[str, Dict[str, str]]:
+    """
+    Find all Chinese and English subtitles in a directory in a single pass.
+    Returns {'chinese': {base_name: path}, 'english': {base_name: path}}
+    """
+    subtitles = {'chinese': {}, 'english': {}}
+    
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.endswith('.srt') and entry.is_file():
+                add_subtitle(subtitles, entry.path)
+    
+    return subtitles
+
+
+def pair_subtitles(subtitles: Dict[str, Dict[str, str]]) -> List[Tuple[str, str, str]]:
+    """
+    Match Chinese and English subtitles from scan_subtitles by base name.
+    Returns list of tuples: (video_basename, chinese_srt_path, english_srt_path)
+    """
+    english_subs = subtitles['english']
+    return [
+        (base_name, chinese_file, english_subs[base_name])
+        for base_name, chinese_file in sorted(subtitles['chinese'].items())
+        if base_name in english_subs
+    ]
 
 
 def find_subtitle_pairs(directory: str) -> List[Tuple[str, str, str]]:
@@ -192,35 +545,7 @@ def find_subtitle_pairs(directory: str) -> List[Tuple[str, str, str]]:
     Find matching Chinese and English subtitle pairs in a directory.
     Returns list of tuples: (video_basename, chinese_srt_path, english_srt_path)
     """
-    pairs = []
-    path = Path(directory)
-    
-    # Find all subtitle files
-    chinese_subs = list(path.glob("*.chs.srt")) + list(path.glob("*.chi.srt")) + list(path.glob("*.zh.srt")) + list(path.glob("*.zho.srt"))
-    english_subs = list(path.glob("*.eng.srt")) + list(path.glob("*.en.srt"))
-    
-    # Match pairs
-    for chinese_file in chinese_subs:
-        # Extract base filename
-        base_name = chinese_file.stem
-        for suffix in ['.chs', '.chi', '.zh', '.zho']:
-            if base_name.endswith(suffix):
-                base_name = base_name[:-len(suffix)]
-                break
-        
-        # Look for matching English subtitle
-        for english_file in english_subs:
-            eng_base = english_file.stem
-            for suffix in ['.eng', '.en']:
-                if eng_base.endswith(suffix):
-                    eng_base = eng_base[:-len(suffix)]
-                    break
-            
-            if base_name == eng_base:
-                pairs.append((base_name, str(chinese_file), str(english_file)))
-                break
-    
-    return pairs
+    return pair_subtitles(scan_subtitles(directory))
 
 
 def process_subtitle_pair(chinese_file: str, english_file: str, output_file: str):
@@ -248,37 +573,256 @@ def process_subtitle_pair(chinese_file: str, english_file: str, output_file: str
         return False
 
 
+def process_subtitle_job(job: Tuple[str, str, str, str]) -> bool:
+    """
+    Process a (directory, video_basename, chinese_srt_path, english_srt_path)
+    job, writing the trilingual subtitle next to the inputs.
+    """
+    directory, base_name, chinese_file, english_file = job
+    output_file = str(Path(directory) / f"{base_name}.srt")
+    return process_subtitle_pair(chinese_file, english_file, output_file)
+
+
+def init_worker(log_queue, level: int):
+    """
+    Set up a worker process to send its log records to the parent process.
+    """
+    logging.getLogger().handlers[:] = [QueueHandler(log_queue)]
+    logger.setLevel(level)
+
+
+def available_cpus() -> int:
+    """
+    Return the number of CPUs this process may run on, honouring CPU
+    affinity (e.g. systemd CPUAffinity= or taskset) where supported.
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def run_jobs_in_pool(jobs: List[Tuple[str, str, str, str]], max_workers: int, context, log_queue) -> List[Optional[bool]]:
+    """
+    Run jobs in a new pool of worker processes. Returns the result of each
+    job, or None for jobs lost because a worker died (e.g. killed for
+    running out of memory), which breaks the pool for every unfinished job.
+    """
+    results = []
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=context,
+        initializer=init_worker,
+        initargs=(log_queue, logger.getEffectiveLevel())
+    ) as executor:
+        futures = [executor.submit(process_subtitle_job, job) for job in jobs]
+        for job, future in zip(jobs, futures):
+            try:
+                results.append(future.result())
+            except BrokenProcessPool:
+                results.append(None)
+            except Exception as e:
+                logger.error(f"  ✗ Error processing {Path(job[2]).name}: {e}")
+                results.append(False)
+    
+    return results
+
+
+def process_pairs(directory: str, pairs: List[Tuple[str, str, str]]) -> List[bool]:
+    """
+    Process subtitle pairs from find_subtitle_pairs, spread over worker
+    processes when there is more than one. Returns the result of each pair.
+    """
+    jobs = [(directory, base_name, chinese_file, english_file) for base_name, chinese_file, english_file in pairs]
+    max_workers = min(len(jobs), available_cpus())
+    if max_workers <= 1:
+        return [process_subtitle_job(job) for job in jobs]
+    
+    # Spawn rather than fork, since the watcher may have an observer thread
+    # running. Workers log through a queue so that records from different
+    # processes are written one at a time by this process's handlers.
+    context = multiprocessing.get_context('spawn')
+    log_queue = context.Queue()
+    listener = QueueListener(log_queue, *logging.getLogger().handlers)
+    listener.start()
+    
+    try:
+        results = run_jobs_in_pool(jobs, max_workers, context, log_queue)
+        
+        # Retry jobs lost to a dead worker one per pool, so that a pair
+        # that keeps crashing its worker only fails itself
+        for i, job in enumerate(jobs):
+            if results[i] is None:
+                results[i] = run_jobs_in_pool([job], 1, context, log_queue)[0]
+            if results[i] is None:
+                logger.error(f"  ✗ Error processing {Path(job[2]).name}: worker process died")
+                results[i] = False
+        
+        return results
+    finally:
+        listener.stop()
+
+
+def pair_key(chinese_file: str, english_file: str) -> Tuple[int, int, int, int]:
+    """
+    Identify a subtitle pair by the inode and modification time of both
+    files. Small ints hash faster than long paths, and a subtitle replaced
+    under the same name counts as a new pair.
+    """
+    chinese_stat = os.stat(chinese_file)
+    english_stat = os.stat(english_file)
+    return (chinese_stat.st_ino, english_stat.st_ino, chinese_stat.st_mtime_ns, english_stat.st_mtime_ns)
+
+
+class SubtitlePairHandler(FileSystemEventHandler):
+    """
+    Tracks the subtitles in a watched directory and processes each pair once.
+    When watchdog is available it also receives filesystem events, so a pair
+    is processed as soon as its second file has been written or renamed in.
+    """
+    
+    def __init__(self, directory: str):
+        super().__init__()
+        self.directory = directory
+        self.subtitles = {'chinese': {}, 'english': {}}
+        self.processed_pairs = set()
+        
+        # Events arrive on the observer thread while rescans run on the
+        # main thread
+        self.lock = threading.Lock()
+    
+    def rescan(self) -> bool:
+        """
+        Rescan the directory and process any new pairs.
+        Returns False if any pair failed and should be retried.
+        """
+        subtitles = scan_subtitles(self.directory)
+        
+        with self.lock:
+            self.subtitles = subtitles
+            new_pairs = []
+            for pair in pair_subtitles(subtitles):
+                key = self.new_pair_key(*pair)
+                if key is not None:
+                    new_pairs.append((pair, key))
+            
+            results = process_pairs(self.directory, [pair for pair, _ in new_pairs])
+            for (_, key), success in zip(new_pairs, results):
+                if success:
+                    self.processed_pairs.add(key)
+        
+        return all(results)
+    
+    def on_closed(self, event):
+        if not event.is_directory:
+            self.handle_path(event.src_path)
+    
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.handle_path(event.dest_path)
+    
+    def handle_path(self, path: str):
+        with self.lock:
+            added = add_subtitle(self.subtitles, path)
+            if added is None:
+                return
+            
+            # Process the pair if this file completed it
+            _, base_name = added
+            chinese_file = self.subtitles['chinese'].get(base_name)
+            english_file = self.subtitles['english'].get(base_name)
+            if chinese_file and english_file:
+                self.process_pair(base_name, chinese_file, english_file)
+    
+    def new_pair_key(self, base_name: str, chinese_file: str, english_file: str) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Return the key of a pair that still needs processing, or None if its
+        output file exists, it was already processed, or it has gone away.
+        """
+        output_file = Path(self.directory) / f"{base_name}.srt"
+        if output_file.exists():
+            return None
+        
+        try:
+            key = pair_key(chinese_file, english_file)
+        except OSError:
+            return None
+        
+        return None if key in self.processed_pairs else key
+    
+    def process_pair(self, base_name: str, chinese_file: str, english_file: str):
+        """
+        Process a pair unless it was already processed or its output file
+        already exists.
+        """
+        key = self.new_pair_key(base_name, chinese_file, english_file)
+        if key is None:
+            return
+        
+        if process_subtitle_job((self.directory, base_name, chinese_file, english_file)):
+            self.processed_pairs.add(key)
+
+
 def watch_directory(directory: str, interval: int = 60):
     """
     Watch a directory for new subtitle pairs and process them automatically.
+    With watchdog installed, new files are handled as inotify events arrive;
+    the periodic rescan then only picks up files moved in from elsewhere and
+    retries failed pairs.
     """
+    use_events = Observer is not None and sys.platform.startswith('linux')
+    
     logger.info(f"Watching directory: {directory}")
+    
+    handler = SubtitlePairHandler(directory)
+    observer = None
+    if use_events:
+        observer = Observer()
+        try:
+            observer.schedule(handler, directory, recursive=False)
+            observer.start()
+            logger.info("Using filesystem events for new files")
+        except OSError as e:
+            # Typically the inotify watch or instance limit (ENOSPC/EMFILE);
+            # polling still finds every pair, just later
+            logger.warning(f"Filesystem events unavailable, falling back to polling: {e}")
+            observer = None
+    
     logger.info(f"Check interval: {interval} seconds")
     logger.info("Press Ctrl+C to stop")
     
-    processed_pairs = set()
+    last_mtime = None
+    last_prune = time.monotonic()
     
     try:
         while True:
-            pairs = find_subtitle_pairs(directory)
+            if time.monotonic() - last_prune >= CACHE_PRUNE_INTERVAL:
+                prune_cache()
+                last_prune = time.monotonic()
             
-            for base_name, chinese_file, english_file in pairs:
-                # Create output filename
-                output_file = str(Path(directory) / f"{base_name}.srt")
-                
-                # Check if already processed
-                pair_key = (chinese_file, english_file)
-                if pair_key in processed_pairs or Path(output_file).exists():
-                    continue
-                
-                # Process the pair
-                if process_subtitle_pair(chinese_file, english_file, output_file):
-                    processed_pairs.add(pair_key)
+            # Skip the scan when nothing was added, removed or renamed
+            # since the last scan that left nothing to retry. A file created
+            # within the same timestamp tick as the scan would not change the
+            # mtime, so an mtime this recent is not trusted and the directory
+            # is rescanned next time.
+            try:
+                scan_time = time.time()
+                mtime = os.stat(directory).st_mtime_ns
+                if mtime != last_mtime and handler.rescan():
+                    if scan_time - mtime / 1e9 >= RACY_MTIME_WINDOW:
+                        last_mtime = mtime
+            except OSError as e:
+                # The directory can briefly disappear, e.g. while a network
+                # share is remounted; keep watching and rescan once it is back
+                logger.warning(f"Could not scan {directory}: {e}")
             
             time.sleep(interval)
             
     except KeyboardInterrupt:
         logger.info("\nStopping watcher...")
+    finally:
+        if observer is not None:
+            observer.stop()
+            observer.join()
 
 
 def main():
@@ -332,6 +876,8 @@ Examples:
         logger.error(f"Error: {args.directory} is not a valid directory")
         return 1
     
+    prune_cache()
+    
     if args.watch:
         watch_directory(args.directory, args.interval)
     else:
@@ -344,11 +890,7 @@ Examples:
         
         logger.info(f"Found {len(pairs)} subtitle pair(s)")
         
-        success_count = 0
-        for base_name, chinese_file, english_file in pairs:
-            output_file = str(Path(args.directory) / f"{base_name}.srt")
-            if process_subtitle_pair(chinese_file, english_file, output_file):
-                success_count += 1
+        success_count = sum(process_pairs(args.directory, pairs))
         
         logger.info(f"\nProcessed {success_count}/{len(pairs)} pairs successfully")
     